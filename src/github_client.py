@@ -1,55 +1,150 @@
 # src/github_client.py
 # Connects to YOUR GitHub — fetches PRs and posts comments
 
-from github import Github
 from dotenv import load_dotenv
+from collections import OrderedDict
+import asyncio
+import httpx
 import os
+import time
 
 load_dotenv()
 
+GITHUB_API_URL  = "https://api.github.com"
+GITHUB_TOKEN    = os.getenv("GITHUB_TOKEN")
+ETAG_CACHE_SIZE = 256
+OPEN_PRS_TTL    = 60       # seconds
+
 class GitHubClient:
     """Handles all GitHub API interactions"""
 
     def __init__(self):
-        token = os.getenv("GITHUB_TOKEN")
-        self.client = Github(token)
+        headers = {
+            "Accept":               "application/vnd.github+json",
+            "X-GitHub-Api-Version": "2022-11-28",
+        }
+        if GITHUB_TOKEN:
+            headers["Authorization"] = f"Bearer {GITHUB_TOKEN}"
+
+        # One HTTP/2 client for the whole process — every API call is
+        # multiplexed over the same pooled TLS connection
+        self.client = httpx.AsyncClient(http2=True, base_url=GITHUB_API_URL, headers=headers)
+
+        # Full URL → (ETag, parsed body, Link header) of the last 200 response
+        self._etag_cache = OrderedDict()
+
+        # repo name → (fetched at, tuple of open PRs) — callers get a list copy
+        self._open_prs_cache = {}
         print("Connected to GitHub!")
 
-    def get_pr_files(self, repo_name: str, pr_number: int) -> list:
+    async def _get_json(self, url: str, params: dict = None) -> tuple:
+        """
+        GET a JSON page, revalidating with If-None-Match
+        A 304 reuses the stored body and doesn't count against the rate limit
+        Returns (body, parsed Link header) — both may be the cached objects,
+        so callers copy what they hand out and never mutate them
+        """
+        request = self.client.build_request("GET", url, params=params)
+        key     = str(request.url)
+        cached  = self._etag_cache.get(key)
+        if cached:
+            request.headers["If-None-Match"] = cached[0]
+
+        response = await self.client.send(request)
+
+        if response.status_code == 304 and cached:
+            self._etag_cache.move_to_end(key)
+            return cached[1], cached[2]
+
+        response.raise_for_status()
+        body  = response.json()
+        links = response.links
+
+        etag = response.headers.get("ETag")
+        if etag:
+            self._etag_cache[key] = (etag, body, links)
+            self._etag_cache.move_to_end(key)
+            if len(self._etag_cache) > ETAG_CACHE_SIZE:
+                self._etag_cache.popitem(last=False)
+
+        return body, links
+
+    async def _get_all_pages(self, url: str, params: dict = None) -> list:
+        """
+        GET a list endpoint with every page
+        Page 1 tells us the last page number, so the rest are fetched concurrently
+        """
+        params = {"per_page": 100, **(params or {})}
+        first, links = await self._get_json(url, params)
+        items = list(first)       # Own list — pages may be shared with the ETag cache
+
+        last_url = links.get("last", {}).get("url")
+        if last_url:
+            last_page = int(httpx.URL(last_url).params.get("page", 1))
+            pages = await asyncio.gather(*(
+                self._get_json(url, {**params, "page": page})
+                for page in range(2, last_page + 1)
+            ))
+            for page, _ in pages:
+                items.extend(page)
+            return items
+
+        # No "last" link — walk the "next" links one by one
+        next_url = links.get("next", {}).get("url")
+        while next_url:
+            page, links = await self._get_json(next_url)
+            items.extend(page)
+            next_url = links.get("next", {}).get("url")
+
+        return items
+
+    async def get_pr_files(self, repo_name: str, pr_number: int) -> list:
         """Fetch all changed files from a Pull Request"""
-        repo  = self.client.get_repo(repo_name)
-        pr    = repo.get_pull(pr_number)
-        files = []
+        pr_files = await self._get_all_pages(f"/repos/{repo_name}/pulls/{pr_number}/files")
+        files    = []
 
-        for file in pr.get_files():
+        for file in pr_files:
             # Only analyze Python files
-            if file.filename.endswith(".py") and file.patch:
+            if file["filename"].endswith(".py") and file.get("patch"):
                 files.append({
-                    "filename": file.filename,
-                    "code":     file.patch,         # The actual code changes
-                    "additions": file.additions,
-                    "deletions": file.deletions
+                    "filename": file["filename"],
+                    "code":     file["patch"],      # The actual code changes
+                    "additions": file["additions"],
+                    "deletions": file["deletions"]
                 })
 
         print(f"Fetched {len(files)} Python files from PR #{pr_number}")
         return files
 
-    def post_pr_comment(self, repo_name: str, 
-                         pr_number: int, comment: str):
+    async def post_pr_comment(self, repo_name: str,
+                               pr_number: int, comment: str):
         """Post AI review comment on the Pull Request"""
-        repo    = self.client.get_repo(repo_name)
-        pr      = repo.get_pull(pr_number)
-        pr.create_issue_comment(comment)
+        # PR conversation comments live on the issues endpoint
+        response = await self.client.post(
+            f"/repos/{repo_name}/issues/{pr_number}/comments",
+            json={"body": comment}
+        )
+        response.raise_for_status()
         print(f"AI review posted on PR #{pr_number}!")
 
-    def get_open_prs(self, repo_name: str) -> list:
+    async def get_open_prs(self, repo_name: str) -> list:
         """Get all open PRs in a repository"""
-        repo = self.client.get_repo(repo_name)
-        prs  = repo.get_pulls(state='open')
-
-        return [{
-            "number": pr.number,
-            "title":  pr.title,
-            "author": pr.user.login,
-            "url":    pr.html_url
-        } for pr in prs]
\ No newline at end of file
+        cached = self._open_prs_cache.get(repo_name)
+        if cached and time.monotonic() - cached[0] < OPEN_PRS_TTL:
+            return list(cached[1])
+
+        prs = await self._get_all_pages(f"/repos/{repo_name}/pulls", {"state": "open"})
+
+        open_prs = tuple({
+            "number": pr["number"],
+            "title":  pr["title"],
+            "author": pr["user"]["login"],
+            "url":    pr["html_url"]
+        } for pr in prs)
+
+        self._open_prs_cache[repo_name] = (time.monotonic(), open_prs)
+        return list(open_prs)
+
+    async def close(self):
+        """Close the pooled HTTP connections"""
+        await self.client.aclose()
@@ -1,41 +1,27 @@
 # src/llm_explainer.py — Handle no issues + better error handling
 
-from groq import Groq
 from dotenv import load_dotenv
 import os
 import traceback
 
 load_dotenv()
 
-class LLMExplainer:
+GROQ_API_KEY = os.getenv("GROQ_API_KEY")
 
-    def __init__(self):
-        self.client = None
+# Most issues sent to the LLM — keeps prompt size and latency bounded
+MAX_PROMPT_ISSUES = 50
 
-    def _get_client(self):
-        if self.client is None:
-            api_key = os.getenv("GROQ_API_KEY")
-            if not api_key:
-                raise ValueError("❌ GROQ_API_KEY is not set in environment variables!")
-            self.client = Groq(api_key=api_key)
-            print("Connected to Groq!")
-        return self.client
+# Score thresholds → badge, checked top to bottom
+SCORE_LEVELS = ((7.0, "@"), (5.0, "#"), (float("-inf"), "*"))
 
-    def generate_review(self, analysis_results: list) -> str:
-        try:
-            # Calculate totals
-            total_critical = sum(len(r["critical"]) for r in analysis_results)
-            total_warnings = sum(len(r["warnings"]) for r in analysis_results)
-            total_info     = sum(len(r["info"])     for r in analysis_results)
-            overall_score  = sum(r["quality_score"] for r in analysis_results) / len(analysis_results)
-            score_emoji    = "@" if overall_score >= 7 else "#" if overall_score >= 5 else "*"
+def _score_emoji(score: float) -> str:
+    return next(emoji for threshold, emoji in SCORE_LEVELS if score >= threshold)
 
-            # ─────────────────────────────────────
-            # If NO issues found — return clean result
-            # No need to call LLM!
-            # ─────────────────────────────────────
-            if total_critical == 0 and total_warnings == 0 and total_info == 0:
-                return f"""##  AI Code Review Report
+# ─────────────────────────────────────
+# Markdown templates — built once at import,
+# filled with str.format() per review
+# ─────────────────────────────────────
+CLEAN_REPORT_TEMPLATE = """##  AI Code Review Report
 
 {score_emoji} **Overall Quality Score: {overall_score:.1f} / 10**
 
@@ -45,40 +31,12 @@ class LLMExplainer:
 No issues found in this PR. The code looks clean and follows best practices!
 
 **Files Reviewed:**
-{chr(10).join(f"- `{r['filename']}`" for r in analysis_results)}
+{file_list}
 
 ---
 * Automated review by AI Code Reviewer using Groq LLaMA3*"""
 
-            # ─────────────────────────────────────
-            # Build issues summary for LLM
-            # ─────────────────────────────────────
-            all_issues_text = ""
-            for result in analysis_results:
-                all_issues_text += f"\nFile: {result['filename']}\n"
-                all_issues_text += f"Quality Score: {result['quality_score']}/10\n"
-
-                for issue in result["critical"]:
-                    all_issues_text += f"- CRITICAL: {issue.issue_type} on line {issue.line_number}: {issue.description}\n"
-
-                for issue in result["warnings"]:
-                    all_issues_text += f"- WARNING: {issue.issue_type} on line {issue.line_number}: {issue.description}\n"
-
-                for issue in result["info"]:
-                    all_issues_text += f"- INFO: {issue.issue_type} on line {issue.line_number}: {issue.description}\n"
-
-            print(f"📊 Issues found — Critical: {total_critical}, Warnings: {total_warnings}, Info: {total_info}")
-
-            # ─────────────────────────────────────
-            # Call Groq LLM
-            # ─────────────────────────────────────
-            print(" Calling Groq API...")
-            client   = self._get_client()
-            response = client.chat.completions.create(
-                model       = "llama3-8b-8192",
-                messages    = [{
-                    "role":    "user",
-                    "content": f"""You are a senior software engineer doing a code review.
+REVIEW_PROMPT_TEMPLATE = """You are a senior software engineer doing a code review.
 
 Here are the issues found:
 {all_issues_text}
@@ -90,18 +48,8 @@ Write a professional, friendly code review that:
 4. Ends with encouragement
 
 Use emojis. Be concise and constructive."""
-                }],
-                temperature = 0.3,
-                max_tokens  = 500
-            )
 
-            llm_explanation = response.choices[0].message.content
-            print("Groq response received!")
-
-            # ─────────────────────────────────────
-            # Build final formatted comment
-            # ─────────────────────────────────────
-            final_comment = f"""## AI Code Review Report
+REPORT_HEADER_TEMPLATE = """## AI Code Review Report
 
 {score_emoji} **Overall Quality Score: {overall_score:.1f} / 10**
 
@@ -123,34 +71,18 @@ Use emojis. Be concise and constructive."""
 
 ###  Detailed Issues
 """
-            # Add per-file details
-            for result in analysis_results:
-                if result["total_issues"] > 0:
-                    final_comment += f"\n**`{result['filename']}`** — Score: {result['quality_score']}/10\n"
 
-                    for issue in result["critical"]:
-                        final_comment += f"\n **{issue.issue_type}** (Line {issue.line_number})\n"
-                        final_comment += f"- Problem: {issue.description}\n"
-                        final_comment += f"- Fix: `{issue.suggestion}`\n"
+FILE_HEADER_TEMPLATE = "\n**`{filename}`** — Score: {quality_score}/10\n"
 
-                    for issue in result["warnings"]:
-                        final_comment += f"\n **{issue.issue_type}** (Line {issue.line_number})\n"
-                        final_comment += f"- Problem: {issue.description}\n"
-                        final_comment += f"- Fix: `{issue.suggestion}`\n"
+ISSUE_TEMPLATE = """
+ **{issue_type}** (Line {line_number})
+- Problem: {description}
+- Fix: `{suggestion}`
+"""
 
-                    for issue in result["info"]:
-                        final_comment += f"\n **{issue.issue_type}** (Line {issue.line_number})\n"
-                        final_comment += f"- Problem: {issue.description}\n"
-                        final_comment += f"- Fix: `{issue.suggestion}`\n"
+REPORT_FOOTER = "\n---\n* Automated review by AI Code Reviewer using Groq LLaMA3*"
 
-            final_comment += "\n---\n* Automated review by AI Code Reviewer using Groq LLaMA3*"
-            return final_comment
-
-        except Exception as e:
-            error_details = traceback.format_exc()
-            print(f"❌ LLM Explainer Error: {error_details}")
-            # Return a basic comment even if LLM fails
-            return f"""##  AI Code Review Report
+FALLBACK_REPORT_TEMPLATE = """##  AI Code Review Report
 
 **AI explanation unavailable** — but here are the raw findings:
 
@@ -160,4 +92,146 @@ Use emojis. Be concise and constructive."""
 
 *Error details logged for debugging.*
 ---
-* Automated review by AI Code Reviewer*"""
\ No newline at end of file
+* Automated review by AI Code Reviewer*"""
+
+class LLMExplainer:
+
+    def __init__(self):
+        self.client = None
+
+    def _get_client(self):
+        if self.client is None:
+            if not GROQ_API_KEY:
+                raise ValueError("❌ GROQ_API_KEY is not set in environment variables!")
+            # Imported here — the Groq SDK is heavy and clean PRs never need it
+            from groq import AsyncGroq
+            self.client = AsyncGroq(api_key=GROQ_API_KEY)
+            print("Connected to Groq!")
+        return self.client
+
+    async def generate_review(self, analysis_results: list) -> str:
+        try:
+            # Calculate totals
+            total_critical = sum(len(r["critical"]) for r in analysis_results)
+            total_warnings = sum(len(r["warnings"]) for r in analysis_results)
+            total_info     = sum(len(r["info"])     for r in analysis_results)
+            overall_score  = sum(r["quality_score"] for r in analysis_results) / len(analysis_results)
+            score_emoji    = _score_emoji(overall_score)
+
+            # ─────────────────────────────────────
+            # If NO issues found — return clean result
+            # No need to call LLM!
+            # ─────────────────────────────────────
+            if total_critical == 0 and total_warnings == 0 and total_info == 0:
+                return CLEAN_REPORT_TEMPLATE.format(
+                    score_emoji   = score_emoji,
+                    overall_score = overall_score,
+                    file_list     = "\n".join(f"- `{r['filename']}`" for r in analysis_results)
+                )
+
+            # ─────────────────────────────────────
+            # Build issues summary for LLM
+            # ─────────────────────────────────────
+            # Only the MAX_PROMPT_ISSUES most severe issues are sent —
+            # criticals first, then warnings, then info
+            # (the detailed section below still lists everything)
+            total_issues  = total_critical + total_warnings + total_info
+            critical_left = min(total_critical, MAX_PROMPT_ISSUES)
+            warnings_left = min(total_warnings, MAX_PROMPT_ISSUES - critical_left)
+            info_left     = min(total_info,     MAX_PROMPT_ISSUES - critical_left - warnings_left)
+
+            # Collect pieces in a list and join once — repeated += copies
+            # the whole buffer on every append
+            issue_lines   = []
+            omitted_files = 0
+            for result in analysis_results:
+                critical = result["critical"][:critical_left]
+                warnings = result["warnings"][:warnings_left]
+                info     = result["info"][:info_left]
+                critical_left -= len(critical)
+                warnings_left -= len(warnings)
+                info_left     -= len(info)
+
+                # Every issue in this file was cut — a bare header would
+                # only suggest the file is clean
+                if result["total_issues"] and not (critical or warnings or info):
+                    omitted_files += 1
+                    continue
+
+                issue_lines.append(f"\nFile: {result['filename']}\n")
+                issue_lines.append(f"Quality Score: {result['quality_score']}/10\n")
+
+                for issue in critical:
+                    issue_lines.append(f"- CRITICAL: {issue.issue_type} on line {issue.line_number}: {issue.description}\n")
+
+                for issue in warnings:
+                    issue_lines.append(f"- WARNING: {issue.issue_type} on line {issue.line_number}: {issue.description}\n")
+
+                for issue in info:
+                    issue_lines.append(f"- INFO: {issue.issue_type} on line {issue.line_number}: {issue.description}\n")
+
+            if total_issues > MAX_PROMPT_ISSUES:
+                in_files = f", {omitted_files} file(s) not shown" if omitted_files else ""
+                issue_lines.append(f"\n[and {total_issues - MAX_PROMPT_ISSUES} more issues omitted for brevity{in_files}]\n")
+
+            all_issues_text = "".join(issue_lines)
+
+            print(f"📊 Issues found — Critical: {total_critical}, Warnings: {total_warnings}, Info: {total_info}")
+
+            # ─────────────────────────────────────
+            # Call Groq LLM
+            # ─────────────────────────────────────
+            print(" Calling Groq API...")
+            client   = self._get_client()
+            response = await client.chat.completions.create(
+                model       = "llama3-8b-8192",
+                messages    = [{
+                    "role":    "user",
+                    "content": REVIEW_PROMPT_TEMPLATE.format(all_issues_text=all_issues_text)
+                }],
+                temperature = 0.3,
+                max_tokens  = 500
+            )
+
+            llm_explanation = response.choices[0].message.content
+            print("Groq response received!")
+
+            # ─────────────────────────────────────
+            # Build final formatted comment
+            # ─────────────────────────────────────
+            comment_parts = [REPORT_HEADER_TEMPLATE.format(
+                score_emoji     = score_emoji,
+                overall_score   = overall_score,
+                total_critical  = total_critical,
+                total_warnings  = total_warnings,
+                total_info      = total_info,
+                llm_explanation = llm_explanation
+            )]
+            # Add per-file details — one formatted block per issue
+            for result in analysis_results:
+                if result["total_issues"] > 0:
+                    comment_parts.append(FILE_HEADER_TEMPLATE.format(
+                        filename      = result["filename"],
+                        quality_score = result["quality_score"]
+                    ))
+
+                    for issue in (*result["critical"], *result["warnings"], *result["info"]):
+                        comment_parts.append(ISSUE_TEMPLATE.format(
+                            issue_type  = issue.issue_type,
+                            line_number = issue.line_number,
+                            description = issue.description,
+                            suggestion  = issue.suggestion
+                        ))
+
+            comment_parts.append(REPORT_FOOTER)
+            return "".join(comment_parts)
+
+        except Exception as e:
+            error_details = traceback.format_exc()
+            print(f"❌ LLM Explainer Error: {error_details}")
+            # Return a basic comment even if LLM fails
+            return FALLBACK_REPORT_TEMPLATE.format(
+                overall_score  = overall_score,
+                total_critical = total_critical,
+                total_warnings = total_warnings
+            )
\ No newline at end of file
@@ -1,14 +1,28 @@
 # src/main.py — Fixed with lazy initialization
 
-from fastapi import FastAPI, Request
+from fastapi import BackgroundTasks, FastAPI, HTTPException, Request
 from dotenv import load_dotenv
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
+import hashlib
+import hmac
+import orjson
 import os
+import threading
 
 # Load env variables FIRST before anything else!
 load_dotenv()
 
 app = FastAPI(title="AI Code Reviewer")
 
+# Optional — when set, every webhook must carry a valid X-Hub-Signature-256
+WEBHOOK_SECRET = os.getenv("WEBHOOK_SECRET")
+_SECRET_BYTES  = (WEBHOOK_SECRET or "").encode()
+_SIG_PREFIX    = b"sha256="
+
+# Bounded pool for per-file ML analysis — keeps it off the event loop
+_analysis_executor = ThreadPoolExecutor(max_workers=min(8, (os.cpu_count() or 1) * 2))
+
 # ─────────────────────────────────────────────
 # Lazy load — create instances ONLY when needed
 # NOT at startup!
@@ -17,11 +31,15 @@ _ml_analyzer   = None
 _github_client = None
 _llm_explainer = None
 
+_ml_analyzer_lock = threading.Lock()
+
 def get_ml_analyzer():
     global _ml_analyzer
-    if _ml_analyzer is None:
-        from src.ml_analyzer import MLCodeAnalyzer
-        _ml_analyzer = MLCodeAnalyzer()
+    # Called from executor threads — build only one
+    with _ml_analyzer_lock:
+        if _ml_analyzer is None:
+            from src.ml_analyzer import MLCodeAnalyzer
+            _ml_analyzer = MLCodeAnalyzer()
     return _ml_analyzer
 
 def get_github_client():
@@ -39,15 +57,36 @@ def get_llm_explainer():
     return _llm_explainer
 
 
+@app.on_event("shutdown")
+async def close_github_client():
+    """Release pooled GitHub connections when the server stops"""
+    if _github_client is not None:
+        await _github_client.close()
+
+
+def verify_webhook_signature(payload: bytes, signature: str | None) -> bool:
+    """Check GitHub's HMAC-SHA256 signature against the raw request body"""
+    mac_hex = hmac.new(_SECRET_BYTES, payload, hashlib.sha256).hexdigest()
+    # Compare bytes in constant time — no str round trip of the digest
+    return hmac.compare_digest(_SIG_PREFIX + mac_hex.encode("ascii"), (signature or "").encode())
+
+
 @app.get("/")
 def home():
     return {"message": " AI Code Reviewer is running!"}
 
 
 @app.post("/webhook")
-async def github_webhook(request: Request):
+async def github_webhook(request: Request, background_tasks: BackgroundTasks):
     """GitHub sends PR events here automatically"""
-    payload = await request.json()
+    # Read the raw bytes once — they feed both the HMAC check and orjson,
+    # which decodes straight from bytes and is several times faster than json
+    body = await request.body()
+
+    if WEBHOOK_SECRET and not verify_webhook_signature(body, request.headers.get("X-Hub-Signature-256")):
+        raise HTTPException(status_code=401, detail="Invalid webhook signature")
+
+    payload = orjson.loads(body)
     action  = payload.get("action", "")
 
     if action not in ["opened", "synchronize"]:
@@ -57,9 +96,12 @@ async def github_webhook(request: Request):
     repo_name = payload["repository"]["full_name"]
 
     print(f"\n New PR #{pr_number} detected in {repo_name}")
-    await run_ai_review(repo_name, pr_number)
 
-    return {"status": "review completed"}
+    # Review runs after the response is sent — GitHub gives webhook
+    # deliveries only 10s before timing out
+    background_tasks.add_task(run_ai_review, repo_name, pr_number)
+
+    return {"status": "accepted"}
 
 
 @app.post("/review/{repo_owner}/{repo_name}/{pr_number}")
@@ -74,13 +116,15 @@ async def run_ai_review(repo_name: str, pr_number: int):
     """Full AI review pipeline"""
     print(f" Starting AI Review for PR #{pr_number}...")
 
-    # Get instances only when needed
-    ml_analyzer   = get_ml_analyzer()
+    # Get instances only when needed — the analyzer compiles its
+    # patterns on first use, so build it off the event loop
+    loop          = asyncio.get_running_loop()
+    ml_analyzer   = await loop.run_in_executor(_analysis_executor, get_ml_analyzer)
     github_client = get_github_client()
     llm_explainer = get_llm_explainer()
 
     # Step 1: Get changed files
-    files = github_client.get_pr_files(repo_name, pr_number)
+    files = await github_client.get_pr_files(repo_name, pr_number)
 
     if not files:
         print("No Python files to review")
@@ -88,19 +132,20 @@ async def run_ai_review(repo_name: str, pr_number: int):
 
     # Step 2: ML Analysis
     print(" Running ML Analysis...")
-    analysis_results = []
+    analysis_results = await asyncio.gather(*(
+        loop.run_in_executor(_analysis_executor, ml_analyzer.analyze, file["code"], file["filename"])
+        for file in files
+    ))
 
-    for file in files:
-        result = ml_analyzer.analyze(file["code"], file["filename"])
-        analysis_results.append(result)
-        print(f"   {file['filename']} — Score: {result['quality_score']}/10")
+    for result in analysis_results:
+        print(f"   {result['filename']} — Score: {result['quality_score']}/10")
 
     # Step 3: LLM Explanation
     print(" Generating Groq LLM explanation...")
-    review_comment = llm_explainer.generate_review(analysis_results)
+    review_comment = await llm_explainer.generate_review(analysis_results)
 
     # Step 4: Post on PR
     print(" Posting review on PR...")
-    github_client.post_pr_comment(repo_name, pr_number, review_comment)
+    await github_client.post_pr_comment(repo_name, pr_number, review_comment)
 
     print(f" AI Review Complete for PR #{pr_number}!")
\ No newline at end of file
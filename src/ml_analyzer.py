@@ -2,19 +2,451 @@
 
 import re
 import ast
+from array import array
+from bisect import bisect_right
+import hashlib
+import json
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from collections import OrderedDict, deque
+from collections.abc import Mapping
 from dataclasses import dataclass
-from typing import List
+from enum import IntEnum
+from functools import lru_cache
+from operator import attrgetter, sub
+from typing import Callable, Iterator, List, NamedTuple
+
+try:
+    import hyperscan        # Optional — `pip install hyperscan` for the fast path
+except ImportError:
+    hyperscan = None
+
+# Bump whenever a change to the checks changes their results —
+# cache entries written by other versions are then never hit
+ANALYZER_VERSION = 2
+
+# Persistent result cache for CI runs — unset keeps results in memory only
+ANALYZER_CACHE_DIR = os.getenv("ANALYZER_CACHE_DIR")
+
+# ─────────────────────────────────────
+# Issue text, formatted on first use — most issues
+# are only counted and scored, never rendered
+# ─────────────────────────────────────
+class LazyText:
+    __slots__ = ("template", "args", "_text")
+
+    def __init__(self, template: str, *args):
+        self.template = template
+        self.args     = args
+        self._text    = None
+
+    def __str__(self) -> str:
+        if self._text is None:
+            self._text = self.template.format(*self.args)
+        return self._text
+
+    def __format__(self, spec: str) -> str:
+        return format(str(self), spec)
+
+    def __repr__(self) -> str:
+        return repr(str(self))
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, (str, LazyText)):
+            return str(self) == str(other)
+        return NotImplemented
+
+    def __hash__(self) -> int:
+        return hash(str(self))
+
+# ─────────────────────────────────────
+# Severity — an int, so it indexes PENALTY and the
+# result buckets directly; prints as its name
+# ─────────────────────────────────────
+class Severity(IntEnum):
+    CRITICAL = 0
+    WARNING  = 1
+    INFO     = 2
+
+    def __str__(self) -> str:
+        return self.name
+
+    def __format__(self, spec: str) -> str:
+        return format(self.name, spec)
 
 # ─────────────────────────────────────
 # Data structure for each issue found
+# Slotted (no per-instance __dict__) and immutable
 # ─────────────────────────────────────
-@dataclass
+@dataclass(slots=True, frozen=True)
 class CodeIssue:
-    severity:    str    # CRITICAL / WARNING / INFO
+    severity:    Severity
     issue_type:  str    # What kind of issue
-    description: str    # What is the issue
+    description: str    # What is the issue (or LazyText)
     line_number:  int   # Where in the code
-    suggestion:  str    # How to fix it
+    suggestion:  str    # How to fix it (or LazyText)
+
+# ─────────────────────────────────────
+# Result of analyzing one file
+# The score and the severity buckets are each worked out on
+# first use, so a CI gate reading only total_issues or the
+# score never builds the lists. It is a read-only Mapping, so
+# report["critical"], `in`, .get() and dict(report) still work
+# like the plain dict this used to be (same keys, same order)
+# ─────────────────────────────────────
+_REPORT_KEYS = ("filename", "quality_score", "total_issues", "critical", "warnings", "info", "issues")
+
+class AnalysisReport(Mapping):
+    __slots__ = ("filename", "issues", "_score", "_buckets")
+
+    def __init__(self, filename: str, issues: List[CodeIssue]):
+        self.filename = filename
+        self.issues   = issues
+        self._score   = None
+        self._buckets = None
+
+    @property
+    def total_issues(self) -> int:
+        return len(self.issues)
+
+    @property
+    def quality_score(self) -> float:
+        if self._score is None:
+            base_score = 10.0
+            for issue in self.issues:
+                base_score -= PENALTY[issue.severity]
+            self._score = max(0.0, round(base_score, 1))   # Minimum score is 0
+        return self._score
+
+    def _bucket(self, severity: Severity) -> List[CodeIssue]:
+        if self._buckets is None:
+            self._buckets = ([], [], [])
+            for issue in self.issues:
+                self._buckets[issue.severity].append(issue)
+        return self._buckets[severity]
+
+    @property
+    def critical(self) -> List[CodeIssue]:
+        return self._bucket(Severity.CRITICAL)
+
+    @property
+    def warnings(self) -> List[CodeIssue]:
+        return self._bucket(Severity.WARNING)
+
+    @property
+    def info(self) -> List[CodeIssue]:
+        return self._bucket(Severity.INFO)
+
+    def __getitem__(self, key: str):
+        if key not in _REPORT_KEYS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __contains__(self, key) -> bool:
+        return key in _REPORT_KEYS
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(_REPORT_KEYS)
+
+    def __len__(self) -> int:
+        return len(_REPORT_KEYS)
+
+    def __repr__(self) -> str:
+        return (f"AnalysisReport(filename={self.filename!r}, "
+                f"quality_score={self.quality_score}, total_issues={self.total_issues})")
+
+# ─────────────────────────────────────
+# Quality score — starts at 10, each issue subtracts
+# its severity's penalty (indexed by Severity)
+# ─────────────────────────────────────
+PENALTY = (
+    2.0,      # CRITICAL: -2 for each critical issue
+    1.0,      # WARNING:  -1 for each warning
+    0.3,      # INFO:     -0.3 for each info
+)
+
+# ─────────────────────────────────────
+# Patterns — compiled once at import
+# They scan the whole file at once, so whitespace is
+# [^\S\n] (never crosses a line) and ^ is per line.
+# Quoted parts use bounded negated classes instead of .+ / .*
+# so crafted input can't make the matcher backtrack for long —
+# each only excludes the quote that opened the literal, so
+# "... '%s'" still counts. The password and API key runs need
+# no cap: they only start right after their literal and stop
+# at the next quote.
+# Lowercase-only patterns run on code.lower() instead of
+# paying for IGNORECASE case folding on every character
+# ─────────────────────────────────────
+_RE_PASSWORD        = re.compile(r'password[^\S\n]*=[^\S\n]*["\'][^"\'\n]+["\']')
+_RE_SQLI            = re.compile(r'execute[^\S\n]*\([^\S\n]*(?:"[^"\n]{0,512}%s[^"\n]{0,512}"|\'[^\'\n]{0,512}%s[^\'\n]{0,512}\')')
+_RE_API_KEY         = re.compile(r'api_key[^\S\n]*=[^\S\n]*["\'][a-z0-9]{20,}["\']')
+_RE_EVAL            = re.compile(r'\beval[^\S\n]*\(')
+_RE_PRINT           = re.compile(r'^[^\S\n]*print[^\S\n]*\(', re.MULTILINE)
+_RE_TODO            = re.compile(r'#[^\S\n]*(todo|fixme|hack|xxx)')
+_RE_BARE_EXCEPT     = re.compile(r'except[^\S\n]*:')
+_RE_MUTABLE_DEFAULT = re.compile(r'def[^\S\n]+\w+[^\S\n]*\(.*=[^\S\n]*(\[\]|\{\})')
+_RE_EQ_NONE         = re.compile(r'==[^\S\n]*None')
+_RE_LOOP            = re.compile(r'^[^\S\n]*(for|while)[^\S\n]+', re.MULTILINE)
+_RE_DB_CALL         = re.compile(r'\.(find|query|execute|select|get)[^\S\n]*\(')
+_RE_STR_CONCAT      = re.compile(r'\+=[^\S\n]*["\']')
+_RE_NEWLINE         = re.compile(r'\n')
+
+# ─────────────────────────────────────
+# Literal finders — same matches as the patterns they
+# stand in for, but driven by str.find (no regex engine).
+# Each yields match start offsets from `pos` onwards
+# ─────────────────────────────────────
+def _skip_blanks(code: str, pos: int) -> int:
+    r"""Skip [^\S\n]* — whitespace that doesn't end the line"""
+    end = len(code)
+    while pos < end and code[pos] != "\n" and code[pos].isspace():
+        pos += 1
+    return pos
+
+def _blank_prefix(code: str, pos: int) -> int:
+    r"""Start of the line if ^[^\S\n]* runs up to pos, else -1"""
+    while pos and code[pos - 1] != "\n" and code[pos - 1].isspace():
+        pos -= 1
+    return pos if not pos or code[pos - 1] == "\n" else -1
+
+def _find_eval(code: str, pos: int) -> Iterator[int]:
+    r"""\beval[^\S\n]*\("""
+    p = code.find("eval", pos)
+    while p != -1:
+        before = code[p - 1] if p else " "
+        if not (before.isalnum() or before == "_") and code.startswith("(", _skip_blanks(code, p + 4)):
+            yield p
+        p = code.find("eval", p + 1)
+
+def _find_print(code: str, pos: int) -> Iterator[int]:
+    r"""^[^\S\n]*print[^\S\n]*\(  (per line)"""
+    p = code.find("print", pos)
+    while p != -1:
+        line_start = _blank_prefix(code, p)
+        if line_start != -1 and code.startswith("(", _skip_blanks(code, p + 5)):
+            yield line_start
+        p = code.find("print", p + 1)
+
+def _find_bare_except(code: str, pos: int) -> Iterator[int]:
+    r"""except[^\S\n]*:"""
+    p = code.find("except", pos)
+    while p != -1:
+        if code.startswith(":", _skip_blanks(code, p + 6)):
+            yield p
+        p = code.find("except", p + 1)
+
+def _find_eq_none(code: str, pos: int) -> Iterator[int]:
+    r"""==[^\S\n]*None"""
+    p = code.find("==", pos)
+    while p != -1:
+        if code.startswith("None", _skip_blanks(code, p + 2)):
+            yield p
+        p = code.find("==", p + 1)
+
+def _find_loops(code: str, pos: int) -> List[int]:
+    r"""^[^\S\n]*(for|while)[^\S\n]+  (per line) — sorted"""
+    starts = []
+    for keyword in ("for", "while"):
+        end = len(keyword)
+        p   = code.find(keyword, pos)
+        while p != -1:
+            line_start = _blank_prefix(code, p)
+            if line_start != -1 and _skip_blanks(code, p + end) > p + end:
+                starts.append(line_start)
+            p = code.find(keyword, p + 1)
+    starts.sort()
+    return starts
+
+# ─────────────────────────────────────
+# Line rules — the issue each pattern reports
+# "{0}" in a description becomes the line number.
+# `trigger` is a substring every match contains — files
+# without it skip the scan.
+# `finder`, when set, replaces the `re` scan of `pattern`.
+# `lowered` rules match code.lower(), i.e. ignore case.
+# `hyperscan=False` keeps a rule on `re` — Hyperscan rejects
+# \b in Unicode mode and takes seconds to refuse big repeats
+# ─────────────────────────────────────
+class LineRule(NamedTuple):
+    pattern:     re.Pattern
+    trigger:     str
+    severity:    Severity
+    issue_type:  str
+    description: str
+    suggestion:  str
+    finder:      Callable[[str, int], Iterator[int]] = None
+    lowered:     bool = False
+    hyperscan:   bool = True
+
+SECURITY_RULES = (
+    LineRule(_RE_PASSWORD, "password", Severity.CRITICAL, "Hardcoded Password",
+             "Hardcoded password found on line {0}",
+             "Use environment variables: os.getenv('PASSWORD')",
+             lowered=True),
+    LineRule(_RE_SQLI, "execute", Severity.CRITICAL, "SQL Injection Risk",
+             "Direct string formatting in SQL query on line {0}",
+             "Use parameterized queries: cursor.execute(sql, (params,))",
+             hyperscan=False),
+    LineRule(_RE_API_KEY, "api_key", Severity.CRITICAL, "Exposed API Key",
+             "Hardcoded API key found on line {0}",
+             "Use environment variables: os.getenv('API_KEY')",
+             lowered=True),
+    LineRule(_RE_EVAL, "eval", Severity.CRITICAL, "Dangerous eval() Usage",
+             "eval() is dangerous and can execute malicious code — line {0}",
+             "Avoid eval(). Use ast.literal_eval() for safe evaluation",
+             finder=_find_eval, hyperscan=False),
+)
+
+QUALITY_RULES = (
+    LineRule(_RE_PRINT, "print", Severity.INFO, "Print Statement Found",
+             "print() found on line {0} — use logging instead",
+             "Replace with: import logging → logging.info('message')",
+             finder=_find_print),
+    LineRule(_RE_TODO, "#", Severity.WARNING, "Unresolved TODO",
+             "Unresolved TODO/FIXME comment on line {0}",
+             "Resolve this before merging to main branch",
+             lowered=True),
+)
+
+BEST_PRACTICE_RULES = (
+    LineRule(_RE_BARE_EXCEPT, "except", Severity.WARNING, "Bare Except Clause",
+             "Catching ALL exceptions is bad practice — line {0}",
+             "Specify exception: except ValueError: or except Exception as e:",
+             finder=_find_bare_except),
+    LineRule(_RE_MUTABLE_DEFAULT, "def", Severity.WARNING, "Mutable Default Argument",
+             "Using mutable default argument on line {0} causes bugs",
+             "Use None as default: def func(items=None): items = items or []"),
+    LineRule(_RE_EQ_NONE, "None", Severity.INFO, "Incorrect None Comparison",
+             "Use 'is None' instead of '== None' on line {0}",
+             "Replace '== None' with 'is None'",
+             finder=_find_eq_none),
+)
+
+# Only checked on lines inside a loop body (or its header)
+LOOP_RULES = (
+    LineRule(_RE_DB_CALL, ".", Severity.WARNING, "Database Query in Loop",
+             "DB query inside loop on line {0} — causes N+1 problem!",
+             "Move query outside loop, fetch all data at once"),
+    LineRule(_RE_STR_CONCAT, "+=", Severity.INFO, "String Concat in Loop",
+             "String concatenation in loop on line {0} is slow",
+             "Use list.append() then ''.join() for better performance"),
+)
+
+# Stable sort key — issues on the same line keep their rule order
+_by_line = attrgetter("line_number")
+
+# ─────────────────────────────────────
+# One file under analysis — what every check shares
+# ─────────────────────────────────────
+class SourceText(NamedTuple):
+    code:        str
+    lower:       str     # code.lower() — haystack for `lowered` rules
+    line_starts: array   # Offset where each line starts
+    hits:        dict    # pattern → lines it matched, for Hyperscan-scanned patterns
+    tree:        ast.AST # Parsed module, or None if the code doesn't parse
+
+# Nodes that can contain function definitions — expressions never do
+_BLOCK_NODES = (ast.stmt, ast.excepthandler, ast.match_case)
+_FUNC_NODES  = (ast.FunctionDef, ast.AsyncFunctionDef)
+
+def _iter_functions(tree: ast.AST) -> Iterator[ast.AST]:
+    """
+    Every (async) function definition, in ast.walk order
+    Only statement-level nodes are visited — expression subtrees are skipped
+    """
+    todo = deque([tree])
+    while todo:
+        node = todo.popleft()
+        for child in ast.iter_child_nodes(node):
+            if isinstance(child, _BLOCK_NODES):
+                todo.append(child)
+        if isinstance(node, _FUNC_NODES):
+            yield node
+
+# ─────────────────────────────────────
+# Hyperscan backend (optional)
+# Every rule pattern Hyperscan handles with the same meaning (UTF-8,
+# Unicode classes) goes into one database and is found in a single
+# scan of the file. Rules marked hyperscan=False keep their own `re` pass
+# ─────────────────────────────────────
+_ALL_RULES = SECURITY_RULES + QUALITY_RULES + BEST_PRACTICE_RULES + LOOP_RULES
+
+_SCANNED_PATTERNS = tuple(rule.pattern for rule in _ALL_RULES if rule.hyperscan) + (_RE_LOOP,)
+
+# Hyperscan scans the original bytes, so lowered rules match caselessly
+_CASELESS_PATTERNS = frozenset(rule.pattern for rule in _ALL_RULES if rule.lowered)
+
+def _hs_flags(pattern: re.Pattern) -> int:
+    flags = hyperscan.HS_FLAG_SOM_LEFTMOST | hyperscan.HS_FLAG_UTF8 | hyperscan.HS_FLAG_UCP
+    if pattern in _CASELESS_PATTERNS:
+        flags |= hyperscan.HS_FLAG_CASELESS
+    if pattern.flags & re.MULTILINE:
+        flags |= hyperscan.HS_FLAG_MULTILINE
+    return flags
+
+def _on_match(pattern_id, start, end, flags, matches):
+    matches.append((pattern_id, start))
+
+class _HyperscanScanner:
+    """Finds the lines each supported pattern matches, in one pass"""
+
+    def __init__(self, patterns: tuple):
+        self.patterns = list(patterns)
+        self.database = hyperscan.Database()
+        self.database.compile(
+            expressions = [p.pattern.encode() for p in self.patterns],
+            ids         = list(range(len(self.patterns))),
+            flags       = [_hs_flags(p) for p in self.patterns],
+        )
+        # Scans release the GIL, so each thread needs its own scratch space
+        self._local = threading.local()
+
+    def scan(self, code: str, line_starts: array) -> dict:
+        scratch = getattr(self._local, "scratch", None)
+        if scratch is None:
+            scratch = self._local.scratch = hyperscan.Scratch(self.database)
+
+        data    = code.encode()
+        matches = []
+        self.database.scan(data, match_event_handler=_on_match, context=matches, scratch=scratch)
+
+        # Hyperscan reports byte offsets — same as str offsets for ASCII
+        if len(data) != len(code):
+            line_starts = array("q", [0])
+            line_starts.extend(m.end() for m in re.finditer(b"\n", data))
+
+        hits = {pattern: [] for pattern in self.patterns}
+        for pattern_id, start in matches:
+            hits[self.patterns[pattern_id]].append(bisect_right(line_starts, start))
+        return hits
+
+@lru_cache(maxsize=1)
+def _shared_scanner() -> _HyperscanScanner:
+    """One compiled database per process, shared by every analyzer"""
+    return _HyperscanScanner(_SCANNED_PATTERNS)
+
+def _cache_key(code: str) -> bytes:
+    person = b"analyzer-v%d" % ANALYZER_VERSION
+    return hashlib.blake2b(code.encode(), digest_size=16, person=person).digest()
+
+def _copy_result(result: "AnalysisReport", filename: str) -> "AnalysisReport":
+    """Copy an analysis result — issues are frozen, so only the list needs copying"""
+    return AnalysisReport(filename, list(result.issues))
+
+@lru_cache(maxsize=None)
+def _ignore_case(pattern: re.Pattern) -> re.Pattern:
+    return re.compile(pattern.pattern, pattern.flags | re.IGNORECASE)
+
+@lru_cache(maxsize=64)   # Bounded — indent depths come from the input
+def _dedent_pattern(indent: int) -> re.Pattern:
+    """A newline, then a line indented at most `indent` that isn't blank or a comment"""
+    return re.compile(r'\n[^\S\n]{0,%d}[^\s#]' % indent)
+
+def _in_body(line: int, body_starts: list, body_ends: list) -> bool:
+    i = bisect_right(body_starts, line) - 1
+    return i >= 0 and line < body_ends[i]
 
 class MLCodeAnalyzer:
     """
@@ -22,237 +454,311 @@ class MLCodeAnalyzer:
     Detects bugs, security issues, and code quality problems
     """
 
-    def analyze(self, code: str, filename: str) -> dict:
+    def __init__(self, cache_size: int = 1024, cache_dir: str = ANALYZER_CACHE_DIR):
+        # "synchronize" events resend every file of the PR, most of them
+        # unchanged — remember results by content so repeats are free.
+        # With a cache_dir, CI runs also reuse results from earlier runs
+        self._cache      = OrderedDict()
+        self._cache_size = cache_size
+        self._cache_lock = threading.Lock()
+        self._cache_dir  = cache_dir
+
+        self._scanner = _shared_scanner() if hyperscan else None
+
+    def analyze(self, code: str, filename: str) -> AnalysisReport:
         """
         Main analysis function
         Takes code as input → Returns issues + quality score
         """
-        issues = []
+        key    = _cache_key(code)
+        cached = self._cache_get(key, filename)
+        if cached is not None:
+            return cached
 
-        # Run all checks
-        issues.extend(self._check_security_issues(code))
-        issues.extend(self._check_code_quality(code))
-        issues.extend(self._check_python_best_practices(code))
-        issues.extend(self._check_performance_issues(code))
-
-        # Calculate quality score
-        quality_score = self._calculate_score(issues, code)
-
-        return {
-            "filename":      filename,
-            "quality_score": quality_score,
-            "total_issues":  len(issues),
-            "critical":      [i for i in issues if i.severity == "CRITICAL"],
-            "warnings":      [i for i in issues if i.severity == "WARNING"],
-            "info":          [i for i in issues if i.severity == "INFO"],
-            "issues":        issues
-        }
+        result = self._analyze(code, filename)
+        self._cache_put(key, result)
+        return result
+
+    def analyze_many(self, files: list, max_workers: int = None) -> list:
+        """
+        Analyze a batch of files ({"filename", "code"} dicts) in parallel
+        worker processes — sidesteps the GIL for big CI runs
+        Returns results in input order; cached files never leave this process
+        """
+        results = [None] * len(files)
+        misses  = []
+        copies  = []      # Same content as a miss earlier in the batch
+        first   = {}      # key → index of the miss that analyzes it
+        for i, file in enumerate(files):
+            key    = _cache_key(file["code"])
+            cached = self._cache_get(key, file["filename"])
+            if cached is not None:
+                results[i] = cached
+            elif key in first:
+                copies.append((i, first[key], file["filename"]))
+            else:
+                first[key] = i
+                misses.append((i, key, file))
+
+        self._analyze_misses(misses, results, max_workers)
+
+        for i, source, filename in copies:
+            results[i] = _copy_result(results[source], filename)
+        return results
+
+    def _analyze_misses(self, misses: list, results: list, max_workers: int):
+        """Fill in results for uncached files and cache them"""
+        workers = min(max_workers or os.cpu_count() or 1, len(misses))
+        if workers < 2:
+            # Not worth starting processes for
+            for i, key, file in misses:
+                results[i] = self._analyze(file["code"], file["filename"])
+                self._cache_put(key, results[i])
+            return
+
+        chunksize = max(1, len(misses) // (workers * 4))
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool:
+            analyzed = pool.map(_analyze_in_worker, [file for _, _, file in misses], chunksize=chunksize)
+            for (i, key, _), result in zip(misses, analyzed):
+                results[i] = result
+                self._cache_put(key, result)
+
+    def _cache_get(self, key: bytes, filename: str):
+        with self._cache_lock:
+            cached = self._cache.get(key)
+            if cached is not None:
+                self._cache.move_to_end(key)
+
+        if cached is None:
+            issues = self._disk_get(key)
+            if issues is None:
+                return None
+            result = AnalysisReport(filename, issues)
+            self._remember(key, result)
+            return result
+
+        # Hand out a copy so callers can't corrupt the cached result
+        return _copy_result(cached, filename)
+
+    def _cache_put(self, key: bytes, result: AnalysisReport):
+        self._remember(key, result)
+        self._disk_put(key, result.issues)
+
+    def _remember(self, key: bytes, result: AnalysisReport):
+        with self._cache_lock:
+            self._cache[key] = _copy_result(result, result.filename)
+            if len(self._cache) > self._cache_size:
+                self._cache.popitem(last=False)   # Evict least recently used
 
     # ─────────────────────────────────────
-    # CHECK 1: Security Issues
+    # On-disk cache — one JSON file of issue rows per content
+    # hash (JSON, not pickle: loading it can't run code)
     # ─────────────────────────────────────
-    def _check_security_issues(self, code: str) -> List[CodeIssue]:
+    def _disk_get(self, key: bytes):
+        if not self._cache_dir:
+            return None
+        try:
+            with open(os.path.join(self._cache_dir, key.hex() + ".json"), encoding="utf-8") as f:
+                rows = json.load(f)
+            if not isinstance(rows, list):
+                return None
+            return [CodeIssue(Severity(row[0]), *row[1:]) for row in rows]
+        except (OSError, ValueError, TypeError, LookupError):
+            return None   # Missing, unreadable or the wrong shape — just analyze again
+
+    def _disk_put(self, key: bytes, issues: list):
+        if not self._cache_dir:
+            return
+        rows = [[int(issue.severity), issue.issue_type, str(issue.description),
+                 issue.line_number, str(issue.suggestion)] for issue in issues]
+        path = os.path.join(self._cache_dir, key.hex() + ".json")
+        tmp  = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            os.makedirs(self._cache_dir, exist_ok=True)
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(rows, f)
+            os.replace(tmp, path)   # Atomic — readers never see half a file
+        except OSError as e:
+            print(f"⚠️ Could not write analysis cache: {e}")
+
+    def _analyze(self, code: str, filename: str) -> AnalysisReport:
+        """Run every check on the code — no caching"""
         issues = []
-        lines = code.split("\n")
 
-        for i, line in enumerate(lines, 1):
+        # Offset where each line starts — checks scan the whole buffer
+        # and map match offsets back to line numbers with a bisect.
+        # A packed array: 8 bytes per line, no int object per line
+        line_starts = array("q", [0])
+        line_starts.extend(m.end() for m in _RE_NEWLINE.finditer(code))
 
-            # Check for hardcoded passwords
-            if re.search(r'password\s*=\s*["\'](.+)["\']', line, re.IGNORECASE):
-                issues.append(CodeIssue(
-                    severity    = "CRITICAL",
-                    issue_type  = "Hardcoded Password",
-                    description = f"Hardcoded password found on line {i}",
-                    line_number = i,
-                    suggestion  = "Use environment variables: os.getenv('PASSWORD')"
-                ))
+        hits = self._scanner.scan(code, line_starts) if self._scanner else {}
 
-            # Check for SQL injection risk
-            if re.search(r'execute\s*\(\s*["\'].*%s.*["\']', line):
-                issues.append(CodeIssue(
-                    severity    = "CRITICAL",
-                    issue_type  = "SQL Injection Risk",
-                    description = f"Direct string formatting in SQL query on line {i}",
-                    line_number = i,
-                    suggestion  = "Use parameterized queries: cursor.execute(sql, (params,))"
-                ))
+        # Parsed once here and shared by every check that needs it
+        try:
+            tree = ast.parse(code)
+        except SyntaxError:
+            tree = None   # Skip AST checks if code has syntax errors
 
-            # Check for hardcoded API keys
-            if re.search(r'api_key\s*=\s*["\'][a-zA-Z0-9]{20,}["\']', line, re.IGNORECASE):
-                issues.append(CodeIssue(
-                    severity    = "CRITICAL",
-                    issue_type  = "Exposed API Key",
-                    description = f"Hardcoded API key found on line {i}",
-                    line_number = i,
-                    suggestion  = "Use environment variables: os.getenv('API_KEY')"
-                ))
+        text = SourceText(code, code.lower(), line_starts, hits, tree)
 
-            # Check for eval() usage
-            if re.search(r'\beval\s*\(', line):
-                issues.append(CodeIssue(
-                    severity    = "CRITICAL",
-                    issue_type  = "Dangerous eval() Usage",
-                    description = f"eval() is dangerous and can execute malicious code — line {i}",
-                    line_number = i,
-                    suggestion  = "Avoid eval(). Use ast.literal_eval() for safe evaluation"
-                ))
+        # Run all checks
+        issues.extend(self._check_security_issues(text))
+        issues.extend(self._check_code_quality(text))
+        issues.extend(self._check_python_best_practices(text))
+        issues.extend(self._check_performance_issues(text))
 
-        return issues
+        return AnalysisReport(filename, issues)
 
     # ─────────────────────────────────────
-    # CHECK 2: Code Quality Issues
+    # CHECK 1: Security Issues
     # ─────────────────────────────────────
-    def _check_code_quality(self, code: str) -> List[CodeIssue]:
+    def _check_security_issues(self, text: SourceText) -> List[CodeIssue]:
         issues = []
-        lines  = code.split("\n")
-
-        for i, line in enumerate(lines, 1):
-
-            # Check line too long (PEP8 standard = max 79 chars)
-            if len(line) > 120:
-                issues.append(CodeIssue(
-                    severity    = "INFO",
-                    issue_type  = "Long Line",
-                    description = f"Line {i} is {len(line)} characters (recommended max: 120)",
-                    line_number = i,
-                    suggestion  = "Break long lines for better readability"
-                ))
-
-            # Check for print statements in production code
-            if re.search(r'^\s*print\s*\(', line):
-                issues.append(CodeIssue(
-                    severity    = "INFO",
-                    issue_type  = "Print Statement Found",
-                    description = f"print() found on line {i} — use logging instead",
-                    line_number = i,
-                    suggestion  = "Replace with: import logging → logging.info('message')"
-                ))
+        self._apply_rules(SECURITY_RULES, text, issues)
+        issues.sort(key=_by_line)
+        return issues
 
-            # Check for TODO comments
-            if re.search(r'#\s*(TODO|FIXME|HACK|XXX)', line, re.IGNORECASE):
-                issues.append(CodeIssue(
-                    severity    = "WARNING",
-                    issue_type  = "Unresolved TODO",
-                    description = f"Unresolved TODO/FIXME comment on line {i}",
-                    line_number = i,
-                    suggestion  = "Resolve this before merging to main branch"
-                ))
+    # ─────────────────────────────────────
+    # CHECK 2: Code Quality Issues
+    # ─────────────────────────────────────
+    def _check_code_quality(self, text: SourceText) -> List[CodeIssue]:
+        code, line_starts = text.code, text.line_starts
+        issues    = []
+        line_ends = line_starts[1:]
+        line_ends.append(len(code) + 1)                 # One past each "\n"
+
+        # Check line too long (PEP8 standard = max 79 chars)
+        # Widths come from a C-level map and the comprehension only
+        # filters, so short lines cost almost nothing
+        long_lines = [(i, width) for i, width in enumerate(map(sub, line_ends, line_starts), 1)
+                      if width > 121]
+        for i, width in long_lines:
+            issues.append(CodeIssue(
+                severity    = Severity.INFO,
+                issue_type  = "Long Line",
+                description = LazyText("Line {0} is {1} characters (recommended max: 120)", i, width - 1),
+                line_number = i,
+                suggestion  = "Break long lines for better readability"
+            ))
+
+        # Check for print statements and TODO comments
+        self._apply_rules(QUALITY_RULES, text, issues)
+        issues.sort(key=_by_line)
 
         # Check for missing docstrings in functions
-        try:
-            tree = ast.parse(code)
-            for node in ast.walk(tree):
-                if isinstance(node, ast.FunctionDef):
-                    if not (node.body and isinstance(node.body[0], ast.Expr)
-                            and isinstance(node.body[0].value, ast.Constant)):
-                        issues.append(CodeIssue(
-                            severity    = "INFO",
-                            issue_type  = "Missing Docstring",
-                            description = f"Function '{node.name}' has no docstring",
-                            line_number = node.lineno,
-                            suggestion  = f'Add docstring: def {node.name}():\n    """What this function does"""'
-                        ))
-        except SyntaxError:
-            pass  # Skip AST check if code has syntax errors
+        if text.tree is not None:
+            for node in _iter_functions(text.tree):
+                if ast.get_docstring(node, clean=False) is None:
+                    issues.append(CodeIssue(
+                        severity    = Severity.INFO,
+                        issue_type  = "Missing Docstring",
+                        description = LazyText("Function '{0}' has no docstring", node.name),
+                        line_number = node.lineno,
+                        suggestion  = LazyText('Add docstring: def {0}():\n    """What this function does"""', node.name)
+                    ))
 
         return issues
 
     # ─────────────────────────────────────
     # CHECK 3: Python Best Practices
     # ─────────────────────────────────────
-    def _check_python_best_practices(self, code: str) -> List[CodeIssue]:
+    def _check_python_best_practices(self, text: SourceText) -> List[CodeIssue]:
         issues = []
-        lines  = code.split("\n")
-
-        for i, line in enumerate(lines, 1):
-
-            # Check for bare except
-            if re.search(r'except\s*:', line):
-                issues.append(CodeIssue(
-                    severity    = "WARNING",
-                    issue_type  = "Bare Except Clause",
-                    description = f"Catching ALL exceptions is bad practice — line {i}",
-                    line_number = i,
-                    suggestion  = "Specify exception: except ValueError: or except Exception as e:"
-                ))
-
-            # Check for mutable default arguments
-            if re.search(r'def\s+\w+\s*\(.*=\s*(\[\]|\{\})', line):
-                issues.append(CodeIssue(
-                    severity    = "WARNING",
-                    issue_type  = "Mutable Default Argument",
-                    description = f"Using mutable default argument on line {i} causes bugs",
-                    line_number = i,
-                    suggestion  = "Use None as default: def func(items=None): items = items or []"
-                ))
-
-            # Check for == None instead of is None
-            if re.search(r'==\s*None', line):
-                issues.append(CodeIssue(
-                    severity    = "INFO",
-                    issue_type  = "Incorrect None Comparison",
-                    description = f"Use 'is None' instead of '== None' on line {i}",
-                    line_number = i,
-                    suggestion  = "Replace '== None' with 'is None'"
-                ))
-
+        self._apply_rules(BEST_PRACTICE_RULES, text, issues)
+        issues.sort(key=_by_line)
         return issues
 
     # ─────────────────────────────────────
     # CHECK 4: Performance Issues
     # ─────────────────────────────────────
-    def _check_performance_issues(self, code: str) -> List[CodeIssue]:
+    def _check_performance_issues(self, text: SourceText) -> List[CodeIssue]:
         issues = []
-        lines  = code.split("\n")
-
-        in_loop    = False
-        loop_lines = []
-
-        for i, line in enumerate(lines, 1):
 
-            # Track if we're inside a loop
-            if re.search(r'^\s*(for|while)\s+', line):
-                in_loop    = True
-                loop_lines = []
-
-            # Check for DB queries inside loops (N+1 problem)
-            if in_loop and re.search(r'\.(find|query|execute|select|get)\s*\(', line):
-                issues.append(CodeIssue(
-                    severity    = "WARNING",
-                    issue_type  = "Database Query in Loop",
-                    description = f"DB query inside loop on line {i} — causes N+1 problem!",
-                    line_number = i,
-                    suggestion  = "Move query outside loop, fetch all data at once"
-                ))
-
-            # Check for string concatenation in loops
-            if in_loop and re.search(r'\+=\s*["\']', line):
-                issues.append(CodeIssue(
-                    severity    = "INFO",
-                    issue_type  = "String Concat in Loop",
-                    description = f"String concatenation in loop on line {i} is slow",
-                    line_number = i,
-                    suggestion  = "Use list.append() then ''.join() for better performance"
-                ))
+        code, line_starts = text.code, text.line_starts
+
+        # Lines that start a for/while loop
+        loop_lines = text.hits.get(_RE_LOOP)
+        if loop_lines is None:
+            loop_lines = [bisect_right(line_starts, start) for start in _find_loops(code, 0)]
+        if not loop_lines:
+            return issues
+
+        # A loop runs from its header down to the next line indented no
+        # deeper than the header — blank and comment lines don't end it.
+        # Loops nested in one already found add nothing, so each outer
+        # body is scanned once
+        body_starts, body_ends = [], []
+        for line in loop_lines:
+            if body_ends and line < body_ends[-1]:
+                continue
+            start  = line_starts[line - 1]
+            indent = _skip_blanks(code, start) - start
+            dedent = _dedent_pattern(indent).search(code, start)
+            body_starts.append(line)
+            body_ends.append(bisect_right(line_starts, dedent.start() + 1) if dedent else len(line_starts) + 1)
+
+        # Check for DB queries (N+1 problem) and string concat inside loops
+        self._apply_rules(LOOP_RULES, text, issues, first_line=body_starts[0])
+        issues = [issue for issue in issues if _in_body(issue.line_number, body_starts, body_ends)]
+        issues.sort(key=_by_line)
 
         return issues
 
-    # ─────────────────────────────────────
-    # CALCULATE QUALITY SCORE
-    # ─────────────────────────────────────
-    def _calculate_score(self, issues: list, code: str) -> float:
+    def _apply_rules(self, rules: tuple, text: SourceText,
+                     issues: List[CodeIssue], first_line: int = 1):
         """
-        Calculate code quality score out of 10
-        based on issues found
+        Find each rule's matches from line `first_line` onwards —
+        Hyperscan hits when available, else the rule's literal finder,
+        else one `re` scan per rule
+        Reports each rule at most once per line
         """
-        base_score = 10.0
+        for rule in rules:
+            lines = text.hits.get(rule.pattern)
+            if lines is None:
+                # A substring test is far cheaper than a regex scan, and most
+                # files never contain most triggers
+                if rule.trigger not in (text.lower if rule.lowered else text.code):
+                    continue
+
+                haystack, pattern = text.code, rule.pattern
+                if rule.lowered:
+                    haystack = text.lower
+                    if len(haystack) != len(text.code):
+                        # lower() grew a character (e.g. "İ"), so offsets no
+                        # longer line up — fold case in the engine instead
+                        haystack, pattern = text.code, _ignore_case(pattern)
+                line_starts = text.line_starts
+                offset      = line_starts[first_line - 1]
+                if rule.finder:
+                    starts = rule.finder(haystack, offset)
+                else:
+                    starts = (match.start() for match in pattern.finditer(haystack, offset))
+                lines = (bisect_right(line_starts, start) for start in starts)
+
+            last_line = 0
+            for line in lines:
+                if line == last_line or line < first_line:
+                    continue
+                last_line = line
+                issues.append(CodeIssue(
+                    severity    = rule.severity,
+                    issue_type  = rule.issue_type,
+                    description = LazyText(rule.description, line),
+                    line_number = line,
+                    suggestion  = rule.suggestion
+                ))
+
+# ─────────────────────────────────────
+# analyze_many() worker processes
+# Patterns and rule tables are module constants, so forked
+# workers share them as-is and spawned ones compile them
+# once on import. Each worker builds one analyzer up front
+# ─────────────────────────────────────
+_worker_analyzer = None
 
-        for issue in issues:
-            if issue.severity == "CRITICAL":
-                base_score -= 2.0      # -2 for each critical issue
-            elif issue.severity == "WARNING":
-                base_score -= 1.0      # -1 for each warning
-            elif issue.severity == "INFO":
-                base_score -= 0.3      # -0.3 for each info
+def _init_worker():
+    global _worker_analyzer
+    _worker_analyzer = MLCodeAnalyzer(cache_size=0, cache_dir=None)
 
-        return max(0.0, round(base_score, 1))   # Minimum score is 0
\ No newline at end of file
+def _analyze_in_worker(file: dict) -> AnalysisReport:
+    return _worker_analyzer._analyze(file["code"], file["filename"])
@@ -0,0 +1,182 @@
+# tests/test_analyzer.py — regression tests for the ML analyzer
+
+import pytest
+
+from src.ml_analyzer import MLCodeAnalyzer, _RE_LOOP, _RE_PRINT, _find_loops, _find_print
+
+
+def lines_of(code: str, issue_type: str) -> list:
+    """Line numbers the analyzer reports for one issue type"""
+    result = MLCodeAnalyzer(cache_dir=None).analyze(code, "sample.py")
+    return [i.line_number for i in result["issues"] if i.issue_type == issue_type]
+
+
+# ─────────────────────────────────────
+# Security patterns
+# ─────────────────────────────────────
+def test_sqli_with_quoted_placeholder_inside_double_quotes():
+    code = 'cursor.execute("SELECT * FROM t WHERE name = \'%s\'" % name)\n'
+    assert lines_of(code, "SQL Injection Risk") == [1]
+
+
+def test_sqli_with_quoted_placeholder_inside_single_quotes():
+    code = "cursor.execute('SELECT * FROM t WHERE name = \"%s\"' % name)\n"
+    assert lines_of(code, "SQL Injection Risk") == [1]
+
+
+def test_sqli_parameterized_query_is_clean():
+    code = 'cursor.execute("SELECT * FROM t WHERE name = ?", (name,))\n'
+    assert lines_of(code, "SQL Injection Risk") == []
+
+
+def test_long_api_key_is_reported():
+    code = 'API_KEY = "' + "a1" * 100 + '"\n'
+    assert lines_of(code, "Exposed API Key") == [1]
+
+
+def test_long_password_is_reported():
+    code = 'password = "' + "x" * 400 + '"\n'
+    assert lines_of(code, "Hardcoded Password") == [1]
+
+
+# ─────────────────────────────────────
+# Literal finders
+# ─────────────────────────────────────
+_FINDER_SAMPLE = (
+    "print(1)\n  print (2)\nx = print(3)\n\tprint\t(4)\n"
+    "  # print(5)\nprint\nprint_x(6)\n \n print(7)"
+)
+
+
+def test_find_print_matches_its_pattern():
+    expected = [m.start() for m in _RE_PRINT.finditer(_FINDER_SAMPLE)]
+    assert list(_find_print(_FINDER_SAMPLE, 0)) == expected
+
+
+def test_find_loops_matches_its_pattern():
+    code = "for x in y:\n  while  True:\nx = for_each\n\tfor\ti in j:\n  #for a in b:\nwhile\n"
+    expected = [m.start() for m in _RE_LOOP.finditer(code)]
+    assert _find_loops(code, 0) == expected
+
+
+# ─────────────────────────────────────
+# Disk cache
+# ─────────────────────────────────────
+_CACHE_SAMPLE = 'password = "hunter2"\nprint(x)\n'
+
+
+def test_cache_dir_round_trip(tmp_path):
+    first  = MLCodeAnalyzer(cache_dir=str(tmp_path)).analyze(_CACHE_SAMPLE, "a.py")
+    assert list(tmp_path.glob("*.json"))
+    second = MLCodeAnalyzer(cache_dir=str(tmp_path)).analyze(_CACHE_SAMPLE, "a.py")
+    assert second.issues == first.issues
+
+
+@pytest.mark.parametrize("content", ["[[]]", "[{}]", "{}", "[1]", "not json"])
+def test_bad_cache_entry_is_ignored(tmp_path, content):
+    expected = MLCodeAnalyzer(cache_dir=None).analyze(_CACHE_SAMPLE, "a.py")
+    MLCodeAnalyzer(cache_dir=str(tmp_path)).analyze(_CACHE_SAMPLE, "a.py")
+    for entry in tmp_path.glob("*.json"):
+        entry.write_text(content, encoding="utf-8")
+    result = MLCodeAnalyzer(cache_dir=str(tmp_path)).analyze(_CACHE_SAMPLE, "a.py")
+    assert result.issues == expected.issues
+
+
+# ─────────────────────────────────────
+# Loop scoping
+# ─────────────────────────────────────
+def test_call_after_loop_body_is_not_flagged():
+    code = (
+        "for user in users:\n"
+        "    names.append(user)\n"
+        "db.query(names)\n"
+    )
+    assert lines_of(code, "Database Query in Loop") == []
+
+
+def test_nested_loop_calls_are_flagged():
+    code = (
+        "def load(groups):\n"
+        "    for group in groups:\n"
+        "        for user in group:\n"
+        "            db.query(user)\n"
+        "        db.get(group)\n"
+        "    db.select(groups)\n"
+    )
+    assert lines_of(code, "Database Query in Loop") == [4, 5]
+
+
+def test_blank_and_comment_lines_stay_in_body():
+    code = (
+        "for user in users:\n"
+        "    name = user.name\n"
+        "\n"
+        "# comment at column zero\n"
+        "    db.query(name)\n"
+        "    out += 'x'\n"
+        "done = True\n"
+        "out += 'y'\n"
+    )
+    assert lines_of(code, "Database Query in Loop") == [5]
+    assert lines_of(code, "String Concat in Loop") == [6]
+
+
+def test_call_on_header_line_is_flagged():
+    code = (
+        "for row in db.query(sql):\n"
+        "    print(row)\n"
+    )
+    assert lines_of(code, "Database Query in Loop") == [1]
+
+
+# ─────────────────────────────────────
+# Batch analysis
+# ─────────────────────────────────────
+_BATCH = [
+    {"filename": "a.py", "code": 'password = "hunter2"\n'},
+    {"filename": "b.py", "code": "print(x)\nexcept:\n    pass\n"},
+    {"filename": "c.py", "code": 'password = "hunter2"\n'},
+    {"filename": "d.py", "code": "for row in rows:\n    db.query(row)\n"},
+    {"filename": "e.py", "code": "x = 1\n"},
+]
+
+
+def summary(result) -> tuple:
+    return result.filename, result.quality_score, result.issues
+
+
+def test_analyze_many_keeps_input_order():
+    results = MLCodeAnalyzer(cache_dir=None).analyze_many(_BATCH, max_workers=1)
+    assert [r["filename"] for r in results] == [f["filename"] for f in _BATCH]
+
+
+def test_analyze_many_duplicates_get_their_own_filename():
+    a, _, c, _, _ = MLCodeAnalyzer(cache_dir=None).analyze_many(_BATCH, max_workers=1)
+    assert (a.filename, c.filename) == ("a.py", "c.py")
+    assert a.issues == c.issues
+
+
+def test_analyze_many_in_processes_matches_analyze():
+    expected = [summary(MLCodeAnalyzer(cache_dir=None).analyze(f["code"], f["filename"])) for f in _BATCH]
+    results  = MLCodeAnalyzer(cache_dir=None).analyze_many(_BATCH, max_workers=2)
+    assert [summary(r) for r in results] == expected
+
+
+# ─────────────────────────────────────
+# Report as a mapping
+# ─────────────────────────────────────
+def test_report_behaves_like_the_old_dict():
+    report = MLCodeAnalyzer(cache_dir=None).analyze(_CACHE_SAMPLE, "a.py")
+    keys   = ["filename", "quality_score", "total_issues", "critical", "warnings", "info", "issues"]
+
+    assert "critical" in report and "missing" not in report
+    assert list(report) == keys
+    assert list(report.keys()) == keys
+    assert report.get("missing") is None
+    assert report.get("filename") == "a.py"
+
+    as_dict = dict(report)
+    assert as_dict["total_issues"] == len(as_dict["issues"]) == 2
+    assert as_dict["critical"] == report.critical
+    with pytest.raises(KeyError):
+        report["missing"]
@@ -0,0 +1,182 @@
+# tests/test_github_client.py — GitHub client against a mock transport
+
+import asyncio
+import json
+
+import httpx
+
+import src.github_client as github_client
+from src.github_client import GitHubClient
+
+FILES_URL = "https://api.github.com/repos/o/r/pulls/5/files"
+
+
+def make_client(monkeypatch, handler) -> GitHubClient:
+    """A GitHubClient whose requests go to `handler` instead of the network"""
+    monkeypatch.setattr(github_client, "GITHUB_TOKEN", "tok")
+    client = GitHubClient()
+    client.client = httpx.AsyncClient(transport=httpx.MockTransport(handler),
+                                      base_url=github_client.GITHUB_API_URL,
+                                      headers=client.client.headers)
+    return client
+
+
+def run(client: GitHubClient, coro):
+    async def go():
+        try:
+            return await coro
+        finally:
+            await client.close()
+    return asyncio.run(go())
+
+
+def page_of_files(page: int) -> list:
+    return [
+        {"filename": f"p{page}.py", "patch": "@@ x", "additions": 1, "deletions": 0},
+        {"filename": "README.md", "patch": "x",   "additions": 1, "deletions": 0},
+        {"filename": "bin.py",                     "additions": 0, "deletions": 0},
+    ]
+
+
+# ─────────────────────────────────────
+# Paging and filtering
+# ─────────────────────────────────────
+def test_get_pr_files_follows_next_links_and_keeps_python(monkeypatch):
+    seen = []
+
+    def handler(request):
+        page = int(request.url.params.get("page", "1"))
+        seen.append(page)
+        headers = {}
+        if page < 3:
+            headers["Link"] = f'<{FILES_URL}?per_page=100&page={page + 1}>; rel="next"'
+        return httpx.Response(200, json=page_of_files(page), headers=headers)
+
+    client = make_client(monkeypatch, handler)
+    files  = run(client, client.get_pr_files("o/r", 5))
+
+    assert seen == [1, 2, 3]
+    assert [f["filename"] for f in files] == ["p1.py", "p2.py", "p3.py"]
+    assert files[0] == {"filename": "p1.py", "code": "@@ x", "additions": 1, "deletions": 0}
+
+
+def test_last_link_fetches_remaining_pages_concurrently(monkeypatch):
+    requested = []
+    both_in   = asyncio.Event()
+
+    async def handler(request):
+        page = int(request.url.params.get("page", "1"))
+        requested.append(page)
+        if page == 1:
+            link = (f'<{FILES_URL}?per_page=100&page=2>; rel="next", '
+                    f'<{FILES_URL}?per_page=100&page=3>; rel="last"')
+            return httpx.Response(200, json=page_of_files(1), headers={"Link": link})
+        # Pages 2 and 3 only answer once both are in flight —
+        # fetched one after the other, this would time out
+        if {2, 3} <= set(requested):
+            both_in.set()
+        await asyncio.wait_for(both_in.wait(), timeout=2)
+        return httpx.Response(200, json=page_of_files(page))
+
+    client = make_client(monkeypatch, handler)
+    files  = run(client, client.get_pr_files("o/r", 5))
+
+    assert sorted(requested) == [1, 2, 3]
+    assert [f["filename"] for f in files] == ["p1.py", "p2.py", "p3.py"]
+
+
+# ─────────────────────────────────────
+# ETag revalidation
+# ─────────────────────────────────────
+def test_not_modified_reuses_cached_body(monkeypatch):
+    sent = []
+
+    def handler(request):
+        sent.append(request.headers.get("If-None-Match"))
+        if request.headers.get("If-None-Match") == '"v1"':
+            return httpx.Response(304, headers={"ETag": '"v1"'})
+        return httpx.Response(200, json=page_of_files(1), headers={"ETag": '"v1"'})
+
+    client = make_client(monkeypatch, handler)
+
+    async def twice():
+        return await client.get_pr_files("o/r", 5), await client.get_pr_files("o/r", 5)
+
+    first, second = run(client, twice())
+
+    assert sent == [None, '"v1"']
+    assert first == second
+    assert [f["filename"] for f in second] == ["p1.py"]
+
+
+# ─────────────────────────────────────
+# Comments and auth
+# ─────────────────────────────────────
+def test_post_pr_comment_posts_to_issue_comments(monkeypatch):
+    sent = []
+
+    def handler(request):
+        sent.append(request)
+        return httpx.Response(201, json={"id": 1})
+
+    client = make_client(monkeypatch, handler)
+    run(client, client.post_pr_comment("o/r", 5, "Looks good"))
+
+    assert len(sent) == 1
+    assert sent[0].method == "POST"
+    assert sent[0].url.path == "/repos/o/r/issues/5/comments"
+    assert json.loads(sent[0].content) == {"body": "Looks good"}
+
+
+def test_requests_carry_auth_and_api_headers(monkeypatch):
+    sent = []
+
+    def handler(request):
+        sent.append(request)
+        return httpx.Response(200, json=[])
+
+    client = make_client(monkeypatch, handler)
+    run(client, client.get_pr_files("o/r", 5))
+
+    headers = sent[0].headers
+    assert headers["Authorization"] == "Bearer tok"
+    assert headers["Accept"] == "application/vnd.github+json"
+    assert headers["X-GitHub-Api-Version"] == "2022-11-28"
+
+
+# ─────────────────────────────────────
+# Cached results are never handed out
+# ─────────────────────────────────────
+def test_not_modified_pages_are_copied(monkeypatch):
+    def handler(request):
+        if request.headers.get("If-None-Match") == '"v1"':
+            return httpx.Response(304, headers={"ETag": '"v1"'})
+        return httpx.Response(200, json=[{"id": 1}], headers={"ETag": '"v1"'})
+
+    client = make_client(monkeypatch, handler)
+
+    async def twice():
+        first = await client._get_all_pages("/repos/o/r/pulls")
+        first.append({"id": 2})
+        return await client._get_all_pages("/repos/o/r/pulls")
+
+    assert run(client, twice()) == [{"id": 1}]
+
+
+def test_open_prs_cache_survives_caller_changes(monkeypatch):
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        pr = {"number": 1, "title": "t", "user": {"login": "me"}, "html_url": "h"}
+        return httpx.Response(200, json=[pr])
+
+    client = make_client(monkeypatch, handler)
+
+    async def twice():
+        first = await client.get_open_prs("o/r")
+        first.clear()
+        return await client.get_open_prs("o/r")
+
+    assert run(client, twice()) == [{"number": 1, "title": "t", "author": "me", "url": "h"}]
+    assert len(calls) == 1
@@ -0,0 +1,40 @@
+# tests/test_llm_explainer.py — prompt building, with the Groq client faked out
+
+import asyncio
+from types import SimpleNamespace
+
+from src.llm_explainer import MAX_PROMPT_ISSUES, LLMExplainer
+from src.ml_analyzer import MLCodeAnalyzer
+
+
+class FakeCompletions:
+    def __init__(self):
+        self.prompts = []
+
+    async def create(self, messages, **kwargs):
+        self.prompts.append(messages[0]["content"])
+        message = SimpleNamespace(content="LLM TEXT")
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+
+def review_prompt(results) -> str:
+    completions = FakeCompletions()
+    explainer   = LLMExplainer()
+    explainer.client = SimpleNamespace(chat=SimpleNamespace(completions=completions))
+    asyncio.run(explainer.generate_review(results))
+    return completions.prompts[0]
+
+
+def test_files_cut_from_prompt_get_no_header():
+    analyzer = MLCodeAnalyzer(cache_dir=None)
+    results  = [
+        analyzer.analyze("print(x)\n" * (MAX_PROMPT_ISSUES + 5), "big.py"),
+        analyzer.analyze("print(y)\n", "late.py"),
+        analyzer.analyze("print(z)\n", "later.py"),
+    ]
+    prompt = review_prompt(results)
+
+    assert "File: big.py" in prompt
+    assert "File: late.py" not in prompt
+    assert "File: later.py" not in prompt
+    assert "[and 7 more issues omitted for brevity, 2 file(s) not shown]" in prompt
@@ -0,0 +1,66 @@
+# tests/test_main.py — webhook signature checks
+
+import hashlib
+import hmac
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+
+import src.main as main
+
+SECRET = "s3cret"
+BODY   = json.dumps({"action": "opened", "number": 7, "repository": {"full_name": "o/r"}}).encode()
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr(main, "WEBHOOK_SECRET", SECRET)
+    monkeypatch.setattr(main, "_SECRET_BYTES", SECRET.encode())
+    reviews = []
+
+    async def fake_review(repo_name, pr_number):
+        reviews.append((repo_name, pr_number))
+
+    monkeypatch.setattr(main, "run_ai_review", fake_review)
+    with TestClient(main.app) as c:
+        c.reviews = reviews
+        yield c
+
+
+def sign(body: bytes, secret: str = SECRET) -> str:
+    return "sha256=" + hmac.new(secret.encode(), body, hashlib.sha256).hexdigest()
+
+
+def test_valid_signature_is_accepted(client):
+    resp = client.post("/webhook", content=BODY, headers={"X-Hub-Signature-256": sign(BODY)})
+    assert resp.status_code == 200
+    assert resp.json() == {"status": "accepted"}
+    assert client.reviews == [("o/r", 7)]
+
+
+def test_wrong_signature_is_rejected(client):
+    resp = client.post("/webhook", content=BODY, headers={"X-Hub-Signature-256": sign(BODY, "other")})
+    assert resp.status_code == 401
+    assert client.reviews == []
+
+
+def test_missing_signature_is_rejected(client):
+    resp = client.post("/webhook", content=BODY)
+    assert resp.status_code == 401
+    assert client.reviews == []
+
+
+def test_non_ascii_signature_is_rejected(client):
+    header = (sign(BODY)[:-1] + "é").encode("latin-1")
+    resp = client.post("/webhook", content=BODY, headers={"X-Hub-Signature-256": header})
+    assert resp.status_code == 401
+    assert client.reviews == []
+
+
+def test_verify_webhook_signature(monkeypatch):
+    monkeypatch.setattr(main, "_SECRET_BYTES", SECRET.encode())
+    assert main.verify_webhook_signature(BODY, sign(BODY))
+    assert not main.verify_webhook_signature(BODY, sign(BODY, "other"))
+    assert not main.verify_webhook_signature(BODY, None)
+    assert not main.verify_webhook_signature(BODY, "sha256=é")